@@ -3,45 +3,217 @@ Events for asyncio
 """
 
 import asyncio
+from asyncio import get_event_loop as _get_event_loop
+from asyncio import get_running_loop as _get_running_loop
+import functools
 import inspect
 import logging
-import types
+from types import MethodType
 import weakref
 __all__ = 'Event',
 
 LOG = logging.getLogger(__name__)
 
+#: For every instance with bound events: a shared weakref to it, and the
+#: Event._instman dicts holding its bindings. Keyed by id() of the instance.
+_owners: dict[int, tuple[weakref.ref, list[dict]]] = {}
 
-def _call_handler_sync(func, *pargs, **kwargs):
+
+def _forget_owner(key: int):
     """
-    Queue a sync function to be called, and wire it into everything
+    Drop all of an instance's bindings, once it's gone.
     """
-    fut = asyncio.get_event_loop().create_future()
+    _, instmans = _owners.pop(key)
+    for instman in instmans:
+        instman.pop(key, None)
+
+
+def _classify(handler) -> tuple[bool, bool]:
+    """
+    Work out how to dispatch to a registered handler.
+
+    Returns:
+        ``(is_coro, is_weak)``
+    """
+    if isinstance(handler, weakref.ReferenceType):
+        return inspect.iscoroutinefunction(handler()), True
+    else:
+        return inspect.iscoroutinefunction(handler), False
+
+
+def _make_weak(func, callback=None) -> weakref.ref:
+    """
+    Make the right kind of weakref for a handler.
+
+    Bound methods are usually temporaries, so they need a
+    :class:`weakref.WeakMethod` rather than a plain ref.
+    """
+    if hasattr(func, '__self__') and hasattr(func, '__func__'):
+        return weakref.WeakMethod(func, callback)
+    else:
+        return weakref.ref(func, callback)
+
+
+def _discard_dead(event_ref: weakref.ref, ref: weakref.ref):
+    """
+    Weakref callback to drop a dead handler from its event, if the event is
+    still around.
+    """
+    event = event_ref()
+    if event is not None:
+        event.discard(ref)
+
+
+def _unpack_weak(ref: weakref.ref) -> tuple:
+    """
+    Break a weak handler down into ``(ref, target_ref, func)`` for dispatch.
+
+    :class:`weakref.WeakMethod` rebuilds the bound method in Python every time
+    it's called, so for those, keep a plain ref to the instance along with the
+    function and bind them ourselves. Otherwise, ``target_ref`` is just ``ref``
+    and ``func`` is None.
+    """
+    if isinstance(ref, weakref.WeakMethod):
+        method = ref()
+        if method is not None:
+            return ref, weakref.ref(method.__self__), method.__func__
+    return ref, ref, None
+
+
+def _deref_weak(weak_handlers, live: list, dead: list):
+    """
+    Resolve unpacked weak handlers, sorting them into the live and the dead.
+    """
+    for ref, target_ref, func in weak_handlers:
+        target = target_ref()
+        if target is None:
+            dead.append(ref)
+        elif func is None:
+            live.append(target)
+        else:
+            live.append(MethodType(func, target))
+
+
+def _resolve(fut, _=None):
+    """
+    Mark ``fut`` as done, unless something beat us to it (eg it was
+    cancelled).
+
+    Can be used as a done callback.
+    """
+    if not fut.done():
+        fut.set_result(None)
 
-    def _wrapper():
-        try:
-            func(*pargs, **kwargs)
-        except BaseException:
-            LOG.exception("Swallowed exception from handler %r", func)
-        finally:
-            fut.set_result(None)
 
-    asyncio.get_event_loop().call_soon_threadsafe(_wrapper)
+def _resolve_after(fut, waits):
+    """
+    Mark ``fut`` as done once all of ``waits`` are.
+    """
+    remaining = len(waits)
+    if not remaining:
+        _resolve(fut)
+        return
 
-    return fut
+    # Counted down by hand, since gather() would add a future of its own
+    def _one_done(_):
+        nonlocal remaining
+        remaining -= 1
+        if not remaining:
+            _resolve(fut)
 
+    for wait in waits:
+        wait.add_done_callback(_one_done)
 
-def _call_handler_async(func, *pargs, **kwargs):
+
+def _run_sync_batch(handlers, pargs, kwargs, done=None, waits=()):
     """
-    Queue an async function to be called.
+    Call each of a batch of sync functions in turn, swallowing exceptions.
+
+    If given, ``done`` is resolved once they've all finished, along with
+    anything in ``waits``.
+
+    Returns:
+        Futures for any coroutines the functions returned.
     """
-    async def _wrapper():
+    awaiting = []
+    for func in handlers:
         try:
-            return await func(*pargs, **kwargs)
+            result = func(*pargs, **kwargs)
         except BaseException:
             LOG.exception("Swallowed exception from handler %r", func)
+        else:
+            # Slow path for things that didn't look async (eg an async __call__).
+            # Only coroutines: futures and tasks are the handler's own business.
+            if result is not None and inspect.iscoroutine(result):
+                awaiting.append(asyncio.ensure_future(_await_handler(func, result)))
+    if done is not None:
+        _resolve_after(done, [*waits, *awaiting])
+    return awaiting
 
-    return asyncio.create_task(_wrapper())
+
+async def _call_handler_async(func, pargs, kwargs):
+    """
+    Call an async function, swallowing exceptions.
+    """
+    try:
+        return await func(*pargs, **kwargs)
+    except BaseException:
+        LOG.exception("Swallowed exception from handler %r", func)
+
+
+async def _await_handler(func, awaitable):
+    """
+    Wait on what a handler returned, swallowing exceptions.
+    """
+    try:
+        return await awaitable
+    except BaseException:
+        LOG.exception("Swallowed exception from handler %r", func)
+
+
+def _start_async_batch(loop, handlers, pargs, kwargs):
+    """
+    Start a task for each of a batch of async functions.
+
+    Returns:
+        The tasks
+    """
+    return [loop.create_task(_call_handler_async(func, pargs, kwargs)) for func in handlers]
+
+
+def _run_batch(loop, sync_handlers, async_handlers, pargs, kwargs, done=None):
+    """
+    Start a batch of async functions and call a batch of sync ones, so that a
+    whole trigger can be handled in a single callback.
+
+    If given, ``done`` is resolved once they've all finished.
+    """
+    waits = _start_async_batch(loop, async_handlers, pargs, kwargs)
+    if sync_handlers:
+        waits += _run_sync_batch(sync_handlers, pargs, kwargs)
+    if done is not None:
+        _resolve_after(done, waits)
+
+
+class _EventDoc:
+    """
+    Stands in for ``__doc__`` on event classes, so that instances can carry
+    their own docstring without needing a ``__dict__``.
+
+    On the class, this is the class docstring.
+    """
+    __slots__ = ('classdoc',)
+
+    def __init__(self, classdoc: str | None):
+        self.classdoc = classdoc
+
+    def __get__(self, obj, type=None):
+        if obj is None or obj._doc is None:
+            return self.classdoc
+        return obj._doc
+
+    def __set__(self, obj, value):
+        obj._doc = value
 
 
 class BoundEvent(set):
@@ -50,9 +222,26 @@ class BoundEvent(set):
 
     Acts as a set for registered handlers.
     """
-    __doc__: str
+    # set already provides __weakref__
+    __slots__ = (
+        '_pman', '_owner', '_doc', '_kinds', '_version', '_dispatch', '_pman_version',
+        '__name__', '__qualname__',
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.__doc__ = _EventDoc(cls.__dict__.get('__doc__'))
 
     def __init__(self, doc: str | None = None, parent: 'Event | None' = None, owner=None):
+        self._doc = None
+        #: How to dispatch to each handler, kept in step with the set contents
+        self._kinds: dict[object, tuple[bool, bool]] = {}
+        #: Bumped every time the handlers change
+        self._version = 0
+        #: Cached dispatch table, including the parent's. See _build_dispatch()
+        self._dispatch = None
+        #: The parent version the dispatch table was built against
+        self._pman_version = None
         if isinstance(doc, str):
             if not doc.startswith("Event:"):
                 doc = f"Event: {doc}"  # I'm not completely convinced this is a good idea
@@ -63,30 +252,252 @@ class BoundEvent(set):
             self.__name__ = parent.__name__
             self.__qualname__ = parent.__qualname__
 
-    def trigger(self, *pargs, **kwargs) -> None:
+    @classmethod
+    def _from_parent(cls, parent: 'Event', owner_ref: weakref.ref) -> 'BoundEvent':
+        """
+        Quickly bind ``parent`` to an instance, skipping the docstring munging
+        in :meth:`__init__` (the parent's has already been done).
+        """
+        self = cls.__new__(cls)
+        self._doc = parent._doc
+        self._kinds = {}
+        self._version = 0
+        self._dispatch = None
+        self._pman_version = None
+        self._pman = parent
+        self._owner = owner_ref
+        self.__name__ = parent.__name__
+        self.__qualname__ = parent.__qualname__
+        return self
+
+    def _build_dispatch(self):
+        """
+        Rebuild the dispatch table after the handlers have changed.
+
+        Returns:
+            ``(sync, async, sync_weak, async_weak)``: tuples of handlers
+            (strong) or unpacked weakrefs to them (see :func:`_unpack_weak`)
+        """
+        parent = self._pman
+        version = self._version
+        buckets = [], [], [], []
+        # _kinds mirrors the set contents, so it doubles as the source. It's
+        # copied first, since a weakref callback can drop a handler part way
+        # through (_unpack_weak() allocates, which can set off the GC).
+        for handler, (is_coro, is_weak) in self._kinds.copy().items():
+            buckets[is_weak * 2 + is_coro].append(  # In the order returned
+                _unpack_weak(handler) if is_weak else handler)
+        if parent is None:
+            dispatch = tuple(map(tuple, buckets))
+            pman_version = None
+        else:
+            # Build on the parent's table, which is shared by all its instances,
+            # instead of going through its handlers again
+            pman_version = parent._version
+            parent_dispatch = parent._dispatch
+            if parent_dispatch is None:
+                parent_dispatch = parent._build_dispatch()
+            dispatch = tuple(
+                inherited + tuple(own) for inherited, own in zip(parent_dispatch, buckets))
+        # If anything changed in the meantime, use this table once, but don't
+        # keep it
+        if self._version == version:
+            self._dispatch = dispatch
+            self._pman_version = pman_version
+        return dispatch
+
+    def _get_handlers(self):
+        """
+        Get the live handlers to call.
+
+        Returns:
+            ``(sync, async)`` sequences of handlers. These are snapshots, safe
+            to hold on to while handlers are added and removed.
+        """
+        # Checked inline, since handlers are usually stable and this is the hot path
+        dispatch = self._dispatch
+        if dispatch is None or (
+                self._pman is not None and self._pman_version != self._pman._version):
+            dispatch = self._build_dispatch()
+        sync_handlers, async_handlers, sync_weak, async_weak = dispatch
+        if sync_weak or async_weak:
+            # Only weak handlers need per-trigger work; the strong ones are used as-is
+            dead = []
+            if sync_weak:
+                sync_handlers = [*sync_handlers]
+                _deref_weak(sync_weak, sync_handlers, dead)
+            if async_weak:
+                async_handlers = [*async_handlers]
+                _deref_weak(async_weak, async_handlers, dead)
+            # Catch any dead refs that were added without a cleanup callback.
+            # Dropping them one at a time avoids the full resync a bulk
+            # difference_update() would do.
+            # Either may have already dropped it, if its callback got in first.
+            for ref in dead:
+                self.discard(ref)
+                if self._pman is not None:
+                    self._pman.discard(ref)
+        return sync_handlers, async_handlers
+
+    def trigger(self, *pargs, **kwargs) -> asyncio.Future:
         """
         Schedules the calling of all the registered handlers. Exceptions are
         consumed.
 
         If the loop is not currently running, queues the callbacks to be called
         after it starts.
+
+        Returns:
+            A future that resolves once all the handlers have finished. There's
+            no need to wait on it.
         """
         owner = None if self._owner is None else self._owner()
+        try:
+            loop = _get_running_loop()
+        except RuntimeError:
+            # Either the loop isn't running yet, or it's running in another thread.
+            loop = _get_event_loop()
+            threadsafe = True
+        else:
+            threadsafe = False
+        pargs = (owner, *pargs)
         # Supposedly orphan tasks will be garbage collected, but I can't reproduce.
-        for func in [
-                f() if isinstance(f, weakref.ReferenceType) else f
-                for f in [*(self._pman or set()), *self]
-        ]:  # Doubles as a snapshot of the handlers, so they can't be mutated in the loop
-            if inspect.iscoroutinefunction(func):
-                _call_handler_async(func, owner, *pargs, **kwargs)
+        sync_handlers, async_handlers = self._get_handlers()
+        if threadsafe:
+            done = loop.create_future()
+            # One wakeup for the whole lot
+            loop.call_soon_threadsafe(
+                _run_batch, loop, sync_handlers, async_handlers, pargs, kwargs, done)
+            return done
+        else:
+            done = loop.create_future()
+            # Start them now, so they run as soon as the caller yields
+            tasks = _start_async_batch(loop, async_handlers, pargs, kwargs)
+            if sync_handlers:
+                loop.call_soon(_run_sync_batch, sync_handlers, pargs, kwargs, done, tasks)
             else:
-                _call_handler_sync(func, owner, *pargs, **kwargs)
+                _resolve_after(done, tasks)
+            return done
 
-    def __call__(self, *pargs, **kwargs):
+    def trigger_now(self, *pargs, **kwargs) -> None:
+        """
+        Calls the registered sync handlers immediately, and starts the async
+        ones on the running loop. Exceptions are consumed.
+
+        This skips the trip through the event loop, so there's no ordering
+        with respect to anything else the loop has queued, and it must be
+        called from the loop's thread. Use :meth:`trigger` for thread-safety.
+
+        Raises:
+            RuntimeError: If the loop isn't running in this thread.
+        """
+        # Checked before any handler is called, so it's all or nothing
+        try:
+            loop = _get_running_loop()
+        except RuntimeError:
+            raise RuntimeError(
+                "trigger_now() must be called from the running event loop; "
+                "use trigger() instead") from None
+        owner = None if self._owner is None else self._owner()
+        pargs = (owner, *pargs)
+        _run_batch(loop, *self._get_handlers(), pargs, kwargs)
+
+    def __call__(self, *pargs, **kwargs) -> asyncio.Future:
         """
         Syntactic sugar for :meth:`trigger`
         """
-        self.trigger(*pargs, **kwargs)
+        return self.trigger(*pargs, **kwargs)
+
+    def _changed(self):
+        """
+        Note that the handlers have changed, invalidating the dispatch table.
+        """
+        self._version += 1
+        self._dispatch = None
+
+    def _resync(self):
+        """
+        Bring the handler kinds back in line after a bulk update.
+        """
+        kinds = self._kinds
+        version = self._version
+        # Snapshotted, in case a weakref callback drops a handler part way through
+        self._kinds = {h: kinds[h] if h in kinds else _classify(h) for h in tuple(self)}
+        if self._version != version:
+            # Something was dropped in the meantime, and might have been missed
+            for handler in tuple(self._kinds):
+                if handler not in self:
+                    self._kinds.pop(handler, None)
+        self._changed()
+
+    def add(self, handler):
+        if handler in self._kinds:
+            # Already registered, so nothing to classify or invalidate
+            return
+        super().add(handler)
+        self._kinds[handler] = _classify(handler)
+        self._changed()
+
+    def discard(self, handler):
+        super().discard(handler)
+        self._kinds.pop(handler, None)
+        self._changed()
+
+    def remove(self, handler):
+        super().remove(handler)
+        self._kinds.pop(handler, None)
+        self._changed()
+
+    def pop(self):
+        handler = super().pop()
+        self._kinds.pop(handler, None)
+        self._changed()
+        return handler
+
+    def clear(self):
+        super().clear()
+        self._kinds.clear()
+        self._changed()
+
+    def update(self, *others):
+        super().update(*others)
+        self._resync()
+
+    def difference_update(self, *others):
+        super().difference_update(*others)
+        self._resync()
+
+    def intersection_update(self, *others):
+        super().intersection_update(*others)
+        self._resync()
+
+    def symmetric_difference_update(self, other):
+        super().symmetric_difference_update(other)
+        self._resync()
+
+    def __ior__(self, other):
+        if super().__ior__(other) is NotImplemented:
+            return NotImplemented
+        self._resync()
+        return self
+
+    def __iand__(self, other):
+        if super().__iand__(other) is NotImplemented:
+            return NotImplemented
+        self._resync()
+        return self
+
+    def __isub__(self, other):
+        if super().__isub__(other) is NotImplemented:
+            return NotImplemented
+        self._resync()
+        return self
+
+    def __ixor__(self, other):
+        if super().__ixor__(other) is NotImplemented:
+            return NotImplemented
+        self._resync()
+        return self
 
     def handler(self, callable, *, weak: bool = False):
         """
@@ -100,15 +511,17 @@ class BoundEvent(set):
             weak: Should we keep a strong or weak ref?
         """
         if weak:
-            if isinstance(callable, types.MethodType):
-                self.add(weakref.WeakMethod(callable, lambda ref: self.remove(ref)))
-            else:
-                self.add(weakref.ref(callable, lambda ref: self.remove(ref)))
+            # The event is only held weakly, so the ref doesn't keep it alive
+            self.add(_make_weak(
+                callable, functools.partial(_discard_dead, weakref.ref(self))))
         else:
             self.add(callable)
         return callable
 
 
+BoundEvent.__doc__ = _EventDoc(BoundEvent.__doc__)
+
+
 class Event(BoundEvent):
     """
     An event that an object may fire.
@@ -117,12 +530,15 @@ class Event(BoundEvent):
 
     Acts as a property descriptor, producing :class:`BoundEvent`
     """
+    __slots__ = ('_instman',)
+
     __name__: str
     __qualname__: str
 
     def __init__(self, doc: str | None = None):
         super().__init__(doc)
-        self._instman = weakref.WeakKeyDictionary()
+        #: Bound events, by id() of their owner. Created on first instance access.
+        self._instman: dict[int, BoundEvent] | None = None
 
     def __set_name__(self, owner: type, name: str):
         self.__name__ = name
@@ -131,9 +547,25 @@ class Event(BoundEvent):
     def __get__(self, obj, type=None) -> BoundEvent:
         if obj is None:
             return self
-        elif obj not in self._instman:
-            self._instman[obj] = BoundEvent(self.__doc__, self, obj)
-        return self._instman[obj]
+        key = id(obj)
+        instman = self._instman
+        if instman is not None:
+            # Fast path: an instance that's already been bound
+            bound = instman.get(key)
+            if bound is not None:
+                return bound
+        else:
+            instman = self._instman = {}
+        # One weakref per instance, shared by all its events, which doubles as
+        # the cleanup hook for their bindings
+        try:
+            owner_ref, instmans = _owners[key]
+        except KeyError:
+            owner_ref, instmans = _owners[key] = (
+                weakref.ref(obj, lambda _: _forget_owner(key)), [])
+        instmans.append(instman)
+        bound = instman[key] = BoundEvent._from_parent(self, owner_ref)
+        return bound
 
     def __set__(self, obj, value):
         # This is so that this appears as a data descriptor.
@@ -1,8 +1,31 @@
+import asyncio
+
 import pytest
 
 import aioevents
 
 
+@pytest.fixture(scope='module')
+def event_loop():
+    # Shared by each module's tests, since setting up a loop costs more than
+    # most of the tests do
+    loop = asyncio.new_event_loop()
+    if hasattr(asyncio, 'eager_task_factory'):  # Python 3.12+
+        # Handler tasks that finish without awaiting never hit the scheduler
+        loop.set_task_factory(asyncio.eager_task_factory)
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def drain_loop(event_loop):
+    """
+    Let anything a test left queued run before the next test starts.
+    """
+    yield
+    event_loop.run_until_complete(asyncio.sleep(0))
+
+
 @pytest.fixture
 def Spam():
     class Spam:
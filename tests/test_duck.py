@@ -1,10 +1,14 @@
 """
 Test how events ducktype
 """
+import gc
 import inspect
+import weakref
 
 import pytest
 
+import aioevents
+
 
 def test_descriptor(Spam):
     """
@@ -41,3 +45,37 @@ def test_cant_set(Spam):
     """
     with pytest.raises(AttributeError):
         Spam().egged = 42
+
+
+def test_binding_cleanup(Spam):
+    """
+    Test that bound events go away with their instance
+    """
+    spam = Spam()
+    assert spam.egged is spam.egged
+    bound = weakref.ref(spam.egged)
+
+    del spam
+    gc.collect()
+
+    assert bound() is None
+
+
+def test_binding_cleanup_many():
+    """
+    Test that all of an instance's bound events go away with it
+    """
+    class Ham:
+        sliced = aioevents.Event("The ham has been sliced")
+        diced = aioevents.Event("The ham has been diced")
+
+    ham = Ham()
+    sliced = weakref.ref(ham.sliced)
+    diced = weakref.ref(ham.diced)
+    assert ham.sliced is not ham.diced
+
+    del ham
+    gc.collect()
+
+    assert sliced() is None
+    assert diced() is None
@@ -1,6 +1,11 @@
 import asyncio
 import gc
 import logging
+import weakref
+
+import pytest
+
+import aioevents
 
 
 # # # IMPORTANT # # #
@@ -20,7 +25,7 @@ async def test_trigger(Spam, sync_handler):
     spam.egged.handler(sync_handler)
     Spam.egged.handler(sync_handler)
 
-    spam.egged()
+    fired = spam.egged()
 
     assert sync_handler.calls == []
 
@@ -31,6 +36,8 @@ async def test_trigger(Spam, sync_handler):
         ((spam,), {}),
     ]
 
+    await fired
+
 
 async def test_trigger_pargs(Spam, sync_handler):
     """
@@ -41,8 +48,7 @@ async def test_trigger_pargs(Spam, sync_handler):
     spam.egged.handler(sync_handler)
     Spam.egged.handler(sync_handler)
 
-    spam.egged(42, "foobar")
-    await asyncio.sleep(0)  # Yield to everything
+    await spam.egged(42, "foobar")
 
     assert sync_handler.calls == [
         ((spam, 42, "foobar"), {}),
@@ -59,8 +65,7 @@ async def test_trigger_kwargs(Spam, sync_handler):
     spam.egged.handler(sync_handler)
     Spam.egged.handler(sync_handler)
 
-    spam.egged(foo='bar')
-    await asyncio.sleep(0)  # Yield to everything
+    await spam.egged(foo='bar')
 
     assert sync_handler.calls == [
         ((spam,), {'foo': 'bar'}),
@@ -68,6 +73,48 @@ async def test_trigger_kwargs(Spam, sync_handler):
     ]
 
 
+async def test_trigger_now(Spam, sync_handler, async_handler):
+    """
+    Test that trigger_now() calls sync handlers immediately
+    """
+    spam = Spam()
+
+    spam.egged.handler(sync_handler)
+    Spam.egged.handler(async_handler)
+
+    spam.egged.trigger_now(42, foo='bar')
+
+    assert sync_handler.calls == [((spam, 42), {'foo': 'bar'})]
+
+    # Whether async handlers have started yet depends on the task factory
+    await asyncio.sleep(0)  # Yield to everything
+
+    assert async_handler.calls == [((spam, 42), {'foo': 'bar'})]
+
+
+def test_trigger_now_noloop(Spam, sync_handler, async_handler):
+    """
+    Test that trigger_now() refuses to run without a running loop, and
+    doesn't call anything when it does
+    """
+    Spam.egged.handler(sync_handler)
+    Spam.egged.handler(async_handler)
+
+    with pytest.raises(RuntimeError):
+        Spam.egged.trigger_now(42)
+
+    assert sync_handler.calls == []
+    assert async_handler.calls == []
+
+
+async def test_trigger_nohandlers(Spam):
+    """
+    Test that triggering with no handlers still gives something to wait on
+    """
+    await Spam().egged()
+    await Spam.egged()
+
+
 def test_trigger_noloop(event_loop, Spam, sync_handler):
     """
     Test that everything works when there's no loop
@@ -96,8 +143,26 @@ async def test_trigger_async(Spam, async_handler):
     spam.egged.handler(async_handler)
     Spam.egged.handler(async_handler)
 
+    await spam.egged(42, foo='bar')
+
+    assert async_handler.calls == [
+        ((spam, 42), {'foo': 'bar'}),
+        ((spam, 42), {'foo': 'bar'}),
+    ]
+
+
+def test_trigger_async_noloop(event_loop, Spam, async_handler):
+    """
+    Test that async handlers get queued when there's no loop
+    """
+    spam = Spam()
+
+    spam.egged.handler(async_handler)
+    Spam.egged.handler(async_handler)
+
     spam.egged(42, foo='bar')
-    await asyncio.sleep(0)  # Yield to everything
+
+    event_loop.run_until_complete(asyncio.sleep(0))
 
     assert async_handler.calls == [
         ((spam, 42), {'foo': 'bar'}),
@@ -117,9 +182,9 @@ async def test_handler_gc(Spam, sync_handler, async_handler):
     Spam.egged.handler(async_handler)
     Spam.egged.handler(sync_handler)
 
-    Spam.egged(42, foo='bar')  # This creates any tasks/threads/etc to call handlers
-    gc.collect()  # This will hopefully clean up any orphans
-    await asyncio.sleep(0)  # Yield to the loop, letting things execute
+    fired = Spam.egged(42, foo='bar')  # This creates any tasks/threads/etc to call handlers
+    gc.collect(0)  # This will hopefully clean up any orphans
+    await fired  # Yield to the loop, letting things execute
 
     assert len(async_handler.calls) == 1
     assert len(sync_handler.calls) == 1
@@ -134,13 +199,27 @@ async def test_trigger_exception(Spam, caplog):
         raise Exception("Boo!")
 
     with caplog.at_level(logging.DEBUG):
-        Spam.egged(foo='bar')
-        await asyncio.sleep(0)  # Yield to everything
+        await Spam.egged(foo='bar')
 
     assert any(r.name in ('aioevents',)
                and r.levelname == 'ERROR' for r in caplog.records), caplog.records
 
 
+async def test_trigger_exception_batch(Spam, sync_handler):
+    """
+    Test that an exception in one handler doesn't stop the others
+    """
+    @Spam.egged.handler
+    def on_egged(sender):
+        raise Exception("Boo!")
+
+    Spam.egged.handler(sync_handler)
+
+    await Spam.egged()
+
+    assert sync_handler.calls == [((None,), {})]
+
+
 async def test_trigger_exception_async(Spam, caplog):
     """
     Test that exceptions produce log events
@@ -150,8 +229,7 @@ async def test_trigger_exception_async(Spam, caplog):
         raise Exception("Boo!")
 
     with caplog.at_level(logging.DEBUG):
-        Spam.egged(foo='bar')
-        await asyncio.sleep(0)  # Yield to everything
+        await Spam.egged(foo='bar')
 
     assert any(r.name in ('aioevents',)
                and r.levelname == 'ERROR' for r in caplog.records), caplog.records
@@ -191,10 +269,9 @@ async def test_weakref(Spam):
     Spam.egged.handler(async_handler, weak=True)
 
     del sync_handler, async_handler
-    gc.collect()
+    gc.collect(0)
 
-    Spam.egged()
-    await asyncio.sleep(0)
+    await Spam.egged()
 
     assert calls == 0
 
@@ -218,10 +295,9 @@ async def test_methods(Spam):
     Spam.egged.handler(h.sync_handler)
     Spam.egged.handler(h.async_handler)
 
-    gc.collect()
+    gc.collect(0)
 
-    Spam.egged()
-    await asyncio.sleep(0)
+    await Spam.egged()
 
     assert calls == 2
 
@@ -246,9 +322,261 @@ async def test_methods_weak(Spam):
     Spam.egged.handler(h.async_handler, weak=True)
 
     del h
+    gc.collect(0)
+
+    await Spam.egged()
+
+    assert calls == 0
+
+
+async def test_methods_weak_alive(Spam):
+    """
+    Test that weakly-held bound method handlers get called while their
+    instance is alive, and stop once it isn't.
+    """
+    calls = []
+
+    class Harry:
+        def sync_handler(self, sender, num):
+            calls.append((self, sender, num))
+
+        async def async_handler(self, sender, num):
+            calls.append((self, sender, num))
+
+    h = Harry()
+    Spam.egged.handler(h.sync_handler, weak=True)
+    Spam.egged.handler(h.async_handler, weak=True)
+
+    await Spam.egged(1)
+    await Spam.egged(2)
+
+    assert sorted(calls, key=lambda c: c[2]) == [
+        (h, None, 1), (h, None, 1), (h, None, 2), (h, None, 2),
+    ]
+
+    del h, calls[:]
+    gc.collect(0)
+
+    await Spam.egged(3)
+
+    assert calls == []
+    assert len(Spam.egged) == 0
+
+
+async def test_set_api(Spam, sync_handler, async_handler):
+    """
+    Test that handlers managed through the set methods work too.
+    """
+    Spam.egged.update({sync_handler, async_handler})
+
+    await Spam.egged(42)
+
+    Spam.egged.discard(async_handler)
+
+    await Spam.egged(24)
+
+    assert sync_handler.calls == [((None, 42), {}), ((None, 24), {})]
+    assert async_handler.calls == [((None, 42), {})]
+
+
+async def test_handlers_change(Spam, SyncHandler):
+    """
+    Test that handlers added between triggers get picked up, including ones
+    added to the class.
+    """
+    spam = Spam()
+    inst_handler = SyncHandler()
+    cls_handler = SyncHandler()
+
+    spam.egged.handler(inst_handler)
+    await spam.egged(1)
+
+    Spam.egged.handler(cls_handler)
+    await spam.egged(2)
+
+    spam.egged.remove(inst_handler)
+    await spam.egged(3)
+
+    assert inst_handler.calls == [((spam, 1), {}), ((spam, 2), {})]
+    assert cls_handler.calls == [((spam, 2), {}), ((spam, 3), {})]
+
+
+async def test_weakref_cleanup(Spam):
+    """
+    Test that dead weak handlers get dropped from the event.
+    """
+    spam = Spam()
+
+    def sync_handler(sender):
+        pass
+
+    def other_handler(sender):
+        pass
+
+    Spam.egged.handler(sync_handler, weak=True)
+    spam.egged.handler(other_handler, weak=True)
+    assert len(Spam.egged) == 1
+    assert len(spam.egged) == 1
+
+    del sync_handler, other_handler
+    gc.collect()
+
+    # Without needing a trigger first
+    assert len(Spam.egged) == 0
+    assert len(spam.egged) == 0
+
+    await spam.egged()
+
+    assert len(Spam.egged) == 0
+    assert len(spam.egged) == 0
+
+
+async def test_weakref_cleanup_raced(Spam, monkeypatch):
+    """
+    Test that cleanup copes with a dead handler that's already been dropped,
+    eg by a weakref callback during the trigger.
+    """
+    def sync_handler(sender):
+        pass
+
+    # No callback, so it's left for the trigger to clean up
+    Spam.egged.add(weakref.ref(sync_handler))
+
+    deref_weak = aioevents._deref_weak
+
+    def racing_deref_weak(weak_handlers, live, dead):
+        deref_weak(weak_handlers, live, dead)
+        for ref in dead:
+            Spam.egged.discard(ref)
+
+    monkeypatch.setattr(aioevents, '_deref_weak', racing_deref_weak)
+
+    del sync_handler
+    gc.collect(0)
+
+    await Spam.egged()
+
+    assert len(Spam.egged) == 0
+
+
+async def test_handler_dropped_during_build(Spam, SyncHandler, monkeypatch):
+    """
+    Test that handlers dropped while the dispatch table is being built (eg by
+    a weakref callback) don't break the trigger, or get called afterwards.
+    """
+    handlers = [SyncHandler(), SyncHandler()]
+    for handler in handlers:
+        Spam.egged.handler(handler, weak=True)
+
+    unpack_weak = aioevents._unpack_weak
+
+    def dropping_unpack_weak(ref):
+        Spam.egged.discard(ref)
+        return unpack_weak(ref)
+
+    monkeypatch.setattr(aioevents, '_unpack_weak', dropping_unpack_weak)
+    await Spam.egged(1)
+    monkeypatch.undo()
+    await Spam.egged(2)
+
+    assert len(Spam.egged) == 0
+    assert [h.calls for h in handlers] == [[((None, 1), {})]] * 2
+
+
+async def test_handler_dropped_during_update(Spam, SyncHandler, monkeypatch):
+    """
+    Test that handlers dropped during a bulk update don't get called.
+    """
+    handlers = [SyncHandler(), SyncHandler()]
+
+    classify = aioevents._classify
+
+    def dropping_classify(handler):
+        Spam.egged.discard(handler)
+        return classify(handler)
+
+    monkeypatch.setattr(aioevents, '_classify', dropping_classify)
+    Spam.egged.update(handlers)
+    monkeypatch.undo()
+    await Spam.egged()
+
+    assert len(Spam.egged) == 0
+    assert [h.calls for h in handlers] == [[], []]
+
+
+async def test_weakref_callbacks_during_trigger(Spam):
+    """
+    Test that weak handlers dying at any point in a trigger (their callbacks
+    run whenever the GC does) don't break it.
+    """
+    class Harry:
+        def __init__(self):
+            self.me = self  # So only the GC can free it
+
+        def sync_handler(self, sender):
+            pass
+
+        async def async_handler(self, sender):
+            pass
+
+    spam = Spam()
+    threshold = gc.get_threshold()
+    gc.set_threshold(1)  # Collect at almost every allocation
+    try:
+        for _ in range(100):
+            for _ in range(5):
+                h = Harry()
+                Spam.egged.handler(h.sync_handler, weak=True)
+                Spam.egged.handler(h.async_handler, weak=True)
+                spam.egged.handler(h.sync_handler, weak=True)
+            del h
+            await spam.egged()
+            await Spam.egged()
+    finally:
+        gc.set_threshold(*threshold)
+
     gc.collect()
 
-    Spam.egged()
+    assert len(Spam.egged) == 0
+    assert len(spam.egged) == 0
+
+
+async def test_async_callable(Spam):
+    """
+    Test that handlers that are async without looking like it still get
+    awaited.
+    """
+    class Handler:
+        calls = []
+
+        async def __call__(self, *pargs, **kwargs):
+            self.calls.append((pargs, kwargs))
+
+    Spam.egged.handler(Handler())
+
+    await Spam.egged(42)
+
+    assert Handler.calls == [((None, 42), {})]
+
+
+async def test_sync_returns_task(Spam, caplog):
+    """
+    Test that tasks returned by sync handlers aren't waited on or logged.
+    """
+    blocker = asyncio.Event()
+    tasks = []
+
+    def handler(sender):
+        task = asyncio.get_running_loop().create_task(blocker.wait())
+        tasks.append(task)
+        return task
+
+    Spam.egged.handler(handler)
+
+    await asyncio.wait_for(Spam.egged(), 1)
+
+    tasks[0].cancel()
     await asyncio.sleep(0)
 
-    assert calls == 0
+    assert tasks[0].cancelled()
+    assert not any(r.levelname == 'ERROR' for r in caplog.records), caplog.records